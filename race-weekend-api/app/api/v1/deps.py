@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+
+import httpx
+from fastapi import Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from redis.asyncio import Redis
+
+from app.core.redis_client import redis_client
+from app.core.security import decode_token
+from app.db.database import AsyncSessionLocal
+from app.exceptions.handlers import AppError
+
+# Shared dependencies for the v1 routers. The non-blocking ones are `async def` so
+# FastAPI runs them inline instead of hopping to the threadpool.
+# auto_error=False so a missing/non-bearer header gets our AppError body, not FastAPI's 403
+bearer = HTTPBearer(auto_error=False)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_redis() -> Redis:
+    return redis_client
+
+async def get_http(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http
+
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    """
+    Caller identity taken from the verified JWT (no DB lookup per request).
+    Role changes apply from the next login.
+    """
+    id: int
+    role: str
+
+async def require_user(creds: HTTPAuthorizationCredentials | None = Depends(bearer)) -> AuthUser:
+    if creds is None:
+        raise AppError("unauthorized", "Missing bearer token.", 401)
+
+    payload = decode_token(creds.credentials)
+    try:
+        return AuthUser(id=int(payload["sub"]), role=payload["role"])
+    except (KeyError, TypeError, ValueError):
+        raise AppError("unauthorized", "Invalid token.", 401)
+
+async def require_admin(user: AuthUser = Depends(require_user)) -> AuthUser:
+    if user.role != "admin":
+        raise AppError("forbidden", "Admin role required.", 403)
+    return user
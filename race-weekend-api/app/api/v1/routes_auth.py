@@ -1,39 +1,46 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.db.database import SessionLocal
+from app.api.v1.deps import get_db
 from app.db.models import User
+from app.core.responses import ORJSONResponse
 from app.core.security import hash_password, verify_password, create_access_token
 from app.exceptions.handlers import AppError
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
 
 router = APIRouter(prefix="/v1/auth", tags=["auth"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Verified against when the email is unknown so login latency doesn't reveal which accounts exist
+_DUMMY_HASH = hash_password("x" * 12)
 
-@router.post("/register", status_code=201)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
-    existing = db.execute(select(User).where(User.email == payload.email)).scalar_one_or_none()
+@router.post("/register", status_code=201, response_class=ORJSONResponse)
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db)):
+    existing = (await db.execute(select(User).where(User.email == payload.email))).scalar_one_or_none()
     if existing:
         raise AppError("email_taken", "That email is already registered.", 400)
 
-    user = User(email=payload.email, password_hash=hash_password(payload.password), role="user")
+    # KDF is CPU-bound; keep it off the event loop
+    password_hash = await run_in_threadpool(hash_password, payload.password)
+    user = User(email=payload.email, password_hash=password_hash, role="user")
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return {"id": user.id, "email": user.email, "role": user.role}
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.execute(select(User).where(User.email == payload.email)).scalar_one_or_none()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = (await db.execute(select(User).where(User.email == payload.email))).scalar_one_or_none()
+    ok = await run_in_threadpool(verify_password, payload.password, user.password_hash if user else _DUMMY_HASH)
+    if not user or not ok:
         raise AppError("invalid_credentials", "Email or password is incorrect.", 401)
 
+    # Legacy bcrypt hash: upgrade to argon2id now that we know the password, so the
+    # account stops paying the slower KDF and stops standing out by login latency
+    if not user.password_hash.startswith("$argon2"):
+        user.password_hash = await run_in_threadpool(hash_password, payload.password)
+        await db.commit()
+
     token = create_access_token(user_id=user.id, role=user.role)
     return TokenResponse(access_token=token)
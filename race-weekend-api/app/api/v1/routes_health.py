@@ -1,41 +1,37 @@
+import asyncio
+
 from fastapi import APIRouter, Depends
-from redis import Redis
+from redis.asyncio import Redis
 from sqlalchemy import text
-from sqlalchemy.orm import Session
-
-from app.core.config import settings
-from app.db.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
 
-router = APIRouter(prefix="/v1/health", tags=["health"])
+from app.api.v1.deps import get_db, get_redis
+from app.core.responses import ORJSONResponse
+from app.db.database import engine
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(prefix="/v1/health", tags=["health"], default_response_class=ORJSONResponse)
 
-def get_redis():
-    return Redis.from_url(settings.REDIS_URL, decode_responses=True)
+# a hung dependency should report as down, not hang the probe
+_CHECK_TIMEOUT_SECONDS = 2.0
 
 @router.get("")
-def health():
+async def health():
     return {"status": "ok"}
 
 @router.get("/detailed")
-def health_detailed(db: Session = Depends(get_db), r: Redis = Depends(get_redis)):
-    db_ok = True
-    redis_ok = True
-
-    try:
-        db.execute(text("SELECT 1"))
-    except Exception:
-        db_ok = False
-
-    try:
-        r.ping()
-    except Exception:
-        redis_ok = False
+async def health_detailed(db: AsyncSession = Depends(get_db), r: Redis = Depends(get_redis)):
+    # both checks run concurrently on the shared DB pool / Redis client
+    db_result, redis_result = await asyncio.gather(
+        asyncio.wait_for(db.execute(text("SELECT 1")), _CHECK_TIMEOUT_SECONDS),
+        asyncio.wait_for(r.ping(), _CHECK_TIMEOUT_SECONDS),
+        return_exceptions=True,
+    )
+    db_ok = not isinstance(db_result, Exception)
+    redis_ok = not isinstance(redis_result, Exception)
 
     status = "ok" if db_ok and redis_ok else "degraded"
-    return {"status": status, "dependencies": {"database": db_ok, "redis": redis_ok}}
+    return {
+        "status": status,
+        "dependencies": {"database": db_ok, "redis": redis_ok},
+        "db_pool": engine.pool.status(),
+    }
@@ -1,76 +1,141 @@
-import json
-import time
+import base64
+import operator
+from datetime import date, datetime
 from typing import Literal
 
 import httpx
-from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response
-from redis import Redis
-from sqlalchemy import select, asc, desc
-from sqlalchemy.orm import Session
-
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, BackgroundTasks, Depends, Response
+from redis.asyncio import Redis
+from sqlalchemy import select, asc, desc, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from app.api.v1.deps import AuthUser, get_db, get_http, get_redis, require_user
 from app.core.config import settings
+from app.core.responses import ORJSONResponse
 from app.core.rate_limit import check_rate_limit
-from app.core.security import decode_token
-from app.db.database import SessionLocal
-from app.db.models import Task, Event, User
+from app.db.models import Task, Event
 from app.exceptions.handlers import AppError
 from app.schemas.tasks import TaskCreate, TaskUpdate, TaskOut
 
 router = APIRouter(prefix="/v1/tasks", tags=["tasks"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_redis():
-    return Redis.from_url(settings.REDIS_URL, decode_responses=True)
-
-def require_user(request: Request, db: Session = Depends(get_db)) -> User:
-    auth = request.headers.get("Authorization")
-    if not auth or not auth.lower().startswith("bearer "):
-        raise AppError("unauthorized", "Missing bearer token.", 401)
-
-    token = auth.split(" ", 1)[1].strip()
-    payload = decode_token(token)
-
-    user = db.get(User, int(payload["sub"]))
-    if not user:
-        raise AppError("unauthorized", "User not found.", 401)
-
-    request.state.user = user
-    request.state.role = payload.get("role")
-    return user
+# list_tasks selects exactly TaskOut's columns (no ORM objects / identity map)
+_TASK_OUT_COLUMNS = [getattr(Task, name) for name in TaskOut.model_fields]
+
+# Process-local tier in front of the Redis list cache: cache_key -> (next_cursor, json body).
+# Short TTL bounds how stale one worker can be relative to Redis.
+_local_cache: TTLCache = TTLCache(maxsize=2048, ttl=settings.LOCAL_CACHE_TTL_SECONDS)
+
+# --- list cache invalidation: versions are embedded in the cache key, writes bump them ---
+# A user's list = their assigned tasks + team-wide (unassigned) tasks, so it depends on
+# their own version and the shared team version. Old entries just expire.
+_TEAM_VERSION_KEY = "ver:tasks:team"
+_local_versions: TTLCache = TTLCache(maxsize=2048, ttl=settings.LOCAL_CACHE_TTL_SECONDS)
+
+def _user_version_key(user_id: int) -> str:
+    return f"ver:tasks:user:{user_id}"
+
+async def tasks_cache_version(r: Redis, user_id: int) -> str:
+    version = _local_versions.get(user_id)
+    if version is None:
+        user_ver, team_ver = await r.mget(_user_version_key(user_id), _TEAM_VERSION_KEY)
+        version = _local_versions[user_id] = f"{user_ver or 0}.{team_ver or 0}"
+    return version
+
+async def invalidate_tasks_cache(r: Redis, *assignee_ids: int | None) -> None:
+    """Bump the list-cache version for everyone who can see a task with these assignees."""
+    if None in assignee_ids:
+        # team-wide task: visible to every user
+        await r.incr(_TEAM_VERSION_KEY)
+        _local_versions.clear()
+        return
+    for user_id in set(assignee_ids):
+        await r.incr(_user_version_key(user_id))
+        _local_versions.pop(user_id, None)
 
 def apply_rate_limit_headers(response: Response, rl) -> None:
     response.headers["X-RateLimit-Limit"] = str(rl.limit)
     response.headers["X-RateLimit-Remaining"] = str(rl.remaining)
     response.headers["X-RateLimit-Reset"] = str(rl.reset)
 
-def enforce_rate_limit(request: Request, response: Response, r: Redis) -> None:
-    user: User | None = getattr(request.state, "user", None)
-    key = f"user:{user.id}" if user else f"ip:{request.client.host}"
+async def enforce_rate_limit(response: Response, r: Redis, user: AuthUser) -> None:
+    key = f"user:{user.id}"
 
-    rl = check_rate_limit(r, key)
+    rl = await check_rate_limit(r, key)
     apply_rate_limit_headers(response, rl)
 
     if not rl.allowed:
-        retry_after = max(0, rl.reset - int(time.time()))
-        response.headers["Retry-After"] = str(retry_after)
+        response.headers["Retry-After"] = str(rl.retry_after)
         raise AppError("rate_limited", "Too many requests.", 429)
 
-@router.get("", response_model=list[TaskOut])
-def list_tasks(
-    request: Request,
+def json_response(body: bytes | str, response: Response) -> Response:
+    # returning a Response directly skips FastAPI's serializer, but also drops
+    # headers set on the injected response (rate limit), so carry them over
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+# --- keyset pagination: the cursor is the (sort value, id) of the last row served ---
+def encode_cursor(sort: str, order: str, value, task_id: int) -> str:
+    raw = orjson.dumps([sort, order, value, task_id], option=orjson.OPT_UTC_Z)
+    return base64.urlsafe_b64encode(raw).decode()
+
+# JSON type each sort column's cursor value must have (due_at: ISO string, or null)
+_CURSOR_VALUE_TYPES = {"id": int, "priority": int, "title": str, "due_at": str}
+
+def _is_json_type(value, expected: type) -> bool:
+    # bool is an int subclass; a JSON true/false is never a valid id or priority
+    return isinstance(value, expected) and not isinstance(value, bool)
+
+def decode_cursor(cursor: str, sort: str, order: str) -> tuple:
+    try:
+        c_sort, c_order, value, task_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except Exception:
+        raise AppError("bad_request", "Invalid cursor.", 400)
+    if (c_sort, c_order) != (sort, order):
+        raise AppError("bad_request", "Cursor does not match sort/order.", 400)
+
+    # values are bound straight into the keyset query, so their types must match the column
+    nullable = sort == "due_at"
+    if not _is_json_type(task_id, int) or not (
+        (nullable and value is None) or _is_json_type(value, _CURSOR_VALUE_TYPES[sort])
+    ):
+        raise AppError("bad_request", "Invalid cursor.", 400)
+    if sort == "due_at" and value is not None:
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            raise AppError("bad_request", "Invalid cursor.", 400)
+    return value, task_id
+
+def keyset_after(sort: str, order: str, value, task_id: int):
+    """Rows strictly after (value, task_id) under ORDER BY <sort> <order> NULLS LAST, id <order>."""
+    beyond = operator.gt if order == "asc" else operator.lt
+    if sort == "id":
+        return beyond(Task.id, task_id)
+
+    col = getattr(Task, sort)
+    if value is None:
+        # already inside the trailing NULL block (due_at only)
+        return col.is_(None) & beyond(Task.id, task_id)
+
+    clause = beyond(tuple_(col, Task.id), tuple_(literal(value, col.type), literal(task_id)))
+    if sort == "due_at":
+        clause = clause | col.is_(None)
+    return clause
+
+# cached as ready-to-send JSON, so this route returns a raw Response (no response_model)
+@router.get("", responses={200: {"model": list[TaskOut]}})
+async def list_tasks(
     response: Response,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
-    # pagination
+    user: AuthUser = Depends(require_user),
+    # pagination: pass X-Next-Cursor back as `after` (skip is kept for older clients)
     skip: int = 0,
     limit: int = 20,
+    after: str | None = None,
     # filtering
     event_id: int | None = None,
     category: str | None = None,
@@ -80,15 +145,24 @@ def list_tasks(
     sort: Literal["id", "priority", "due_at", "title"] = "id",
     order: Literal["asc", "desc"] = "asc",
 ):
-    enforce_rate_limit(request, response, r)
-    user: User = request.state.user
-
-    cache_key = f"cache:tasks:{user.id}:{skip}:{limit}:{event_id}:{category}:{completed}:{priority}:{sort}:{order}"
-    cached = r.get(cache_key)
-    if cached:
-        return json.loads(cached)
-
-    stmt = select(Task)
+    await enforce_rate_limit(response, r, user)
+
+    version = await tasks_cache_version(r, user.id)
+    cache_key = f"cache:tasks:{user.id}:{version}:{skip}:{limit}:{after}:{event_id}:{category}:{completed}:{priority}:{sort}:{order}"
+    entry = _local_cache.get(cache_key)
+    if entry is None:
+        cached = await r.get(cache_key)
+        if cached:
+            # stored as "<next cursor>\n<json>"; orjson never emits a raw newline
+            next_cursor, _, body = cached.partition("\n")
+            entry = _local_cache[cache_key] = (next_cursor, body)
+    if entry is not None:
+        next_cursor, body = entry
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return json_response(body, response)
+
+    stmt = select(*_TASK_OUT_COLUMNS)
 
     # users only see tasks assigned to them OR tasks with no assignee (team-wide)
     stmt = stmt.where((Task.assignee_id == user.id) | (Task.assignee_id.is_(None)))
@@ -102,30 +176,44 @@ def list_tasks(
     if priority is not None:
         stmt = stmt.where(Task.priority == priority)
 
-    ordering = asc(getattr(Task, sort)) if order == "asc" else desc(getattr(Task, sort))
-    stmt = stmt.order_by(ordering).offset(skip).limit(limit)
+    if after is not None:
+        stmt = stmt.where(keyset_after(sort, order, *decode_cursor(after, sort, order)))
+
+    # id breaks ties so the cursor position is unique; NULL due dates always sort last
+    direction = asc if order == "asc" else desc
+    ordering = [direction(Task.id)]
+    if sort != "id":
+        ordering.insert(0, direction(getattr(Task, sort)).nulls_last())
+    stmt = stmt.order_by(*ordering).offset(skip).limit(limit)
 
-    tasks = db.execute(stmt).scalars().all()
-    data = [TaskOut.model_validate(t).model_dump() for t in tasks]
+    rows = (await db.execute(stmt)).mappings().all()
+    # OPT_UTC_Z matches Pydantic's datetime output on the other task routes
+    body = orjson.dumps([dict(row) for row in rows], option=orjson.OPT_UTC_Z)
 
-    r.setex(cache_key, settings.CACHE_TTL_SECONDS, json.dumps(data))
-    return data
+    next_cursor = ""
+    # a full page may have more after it (limit=0 is a valid, empty page)
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, order, last[sort], last["id"])
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    await r.setex(cache_key, settings.CACHE_TTL_SECONDS, next_cursor.encode() + b"\n" + body)
+    _local_cache[cache_key] = (next_cursor, body)
+    return json_response(body, response)
 
 @router.post("", status_code=201, response_model=TaskOut)
-def create_task(
-    request: Request,
+async def create_task(
     response: Response,
     payload: TaskCreate,
     background: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
+    user: AuthUser = Depends(require_user),
 ):
-    enforce_rate_limit(request, response, r)
-    user: User = request.state.user
+    await enforce_rate_limit(response, r, user)
 
     # Validate event exists
-    event = db.get(Event, payload.event_id)
+    event = await db.get(Event, payload.event_id)
     if not event:
         raise AppError("bad_request", "Invalid event_id.", 400)
 
@@ -136,31 +224,29 @@ def create_task(
 
     task = Task(**payload.model_dump())
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
+
+    await invalidate_tasks_cache(r, task.assignee_id)
 
     # background task demo: "send reminder" to assignee (simulated)
     background.add_task(_bg_log_task_created, task.id, task.title)
-
-    # bust cache for this user (simple approach: let TTL expire; or delete wildcard keys if desired)
     return task
 
 def _bg_log_task_created(task_id: int, title: str):
     print(f"[bg] Created task {task_id}: {title}")
 
 @router.get("/{task_id}", response_model=TaskOut)
-def get_task(
-    request: Request,
+async def get_task(
     response: Response,
     task_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
+    user: AuthUser = Depends(require_user),
 ):
-    enforce_rate_limit(request, response, r)
-    user: User = request.state.user
+    await enforce_rate_limit(response, r, user)
 
-    task = db.get(Task, task_id)
+    task = await db.get(Task, task_id, options=[raiseload("*")])
     if not task:
         raise AppError("not_found", "Task not found.", 404)
 
@@ -171,19 +257,17 @@ def get_task(
     return task
 
 @router.patch("/{task_id}", response_model=TaskOut)
-def update_task(
-    request: Request,
+async def update_task(
     response: Response,
     task_id: int,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
+    user: AuthUser = Depends(require_user),
 ):
-    enforce_rate_limit(request, response, r)
-    user: User = request.state.user
+    await enforce_rate_limit(response, r, user)
 
-    task = db.get(Task, task_id)
+    task = await db.get(Task, task_id, options=[raiseload("*")])
     if not task:
         raise AppError("not_found", "Task not found.", 404)
 
@@ -195,26 +279,26 @@ def update_task(
     if "assignee_id" in data and data["assignee_id"] not in (None, user.id) and user.role != "admin":
         raise AppError("forbidden", "Only admins can assign tasks to other users.", 403)
 
+    previous_assignee_id = task.assignee_id
     for k, v in data.items():
         setattr(task, k, v)
 
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
+    await invalidate_tasks_cache(r, previous_assignee_id, task.assignee_id)
     return task
 
 @router.delete("/{task_id}", status_code=204)
-def delete_task(
-    request: Request,
+async def delete_task(
     response: Response,
     task_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
+    user: AuthUser = Depends(require_user),
 ):
-    enforce_rate_limit(request, response, r)
-    user: User = request.state.user
+    await enforce_rate_limit(response, r, user)
 
-    task = db.get(Task, task_id)
+    task = await db.get(Task, task_id, options=[raiseload("*")])
     if not task:
         raise AppError("not_found", "Task not found.", 404)
 
@@ -224,28 +308,34 @@ def delete_task(
     if task.assignee_id not in (None, user.id) and user.role != "admin":
         raise AppError("forbidden", "You do not have access to this task.", 403)
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
+    await invalidate_tasks_cache(r, task.assignee_id)
     return None
 
 # --- async httpx requirement: weather for an event's track location ---
-@router.get("/event/{event_id}/weather")
+@router.get("/event/{event_id}/weather", response_class=ORJSONResponse)
 async def get_event_weather(
-    request: Request,
     response: Response,
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
+    client: httpx.AsyncClient = Depends(get_http),
+    user: AuthUser = Depends(require_user),
 ):
-    enforce_rate_limit(request, response, r)
+    await enforce_rate_limit(response, r, user)
 
-    event = db.get(Event, event_id)
+    event = await db.get(Event, event_id)
     if not event:
         raise AppError("not_found", "Event not found.", 404)
 
-    # Use Open-Meteo geocoding + forecast (no API key needed)
-    async with httpx.AsyncClient(timeout=8.0) as client:
+    # Use Open-Meteo geocoding + forecast (no API key needed).
+    # Forecast needs the coordinates, so the calls are sequential; geocoding is cached.
+    geo_key = f"geo:{event.city}:{event.state}".lower()
+    cached_geo = await r.get(geo_key)
+    if cached_geo:
+        lat, lon = (float(v) for v in cached_geo.split(","))
+    else:
         geo = await client.get(
             "https://geocoding-api.open-meteo.com/v1/search",
             params={"name": f"{event.city}, {event.state}", "count": 1, "language": "en", "format": "json"},
@@ -259,7 +349,15 @@ async def get_event_weather(
 
         lat = gj["results"][0]["latitude"]
         lon = gj["results"][0]["longitude"]
-
+        await r.setex(geo_key, settings.GEOCODE_CACHE_TTL_SECONDS, f"{lat},{lon}")
+
+    # forecasts update roughly hourly; 2 decimals (~1 km) lets nearby events share an entry
+    lat, lon = round(lat, 2), round(lon, 2)
+    wx_key = f"wx:{lat:.2f}:{lon:.2f}:{date.today()}"
+    cached_wx = await r.get(wx_key)
+    if cached_wx:
+        daily = orjson.loads(cached_wx)
+    else:
         forecast = await client.get(
             "https://api.open-meteo.com/v1/forecast",
             params={
@@ -272,25 +370,27 @@ async def get_event_weather(
         if forecast.status_code != 200:
             raise AppError("bad_gateway", "Weather provider failed.", 502)
 
+        daily = forecast.json().get("daily", {})
+        await r.setex(wx_key, settings.WEATHER_CACHE_TTL_SECONDS, orjson.dumps(daily))
+
     return {
         "event": {"id": event.id, "name": event.name, "track": event.track_name, "city": event.city, "state": event.state},
-        "forecast": forecast.json().get("daily", {}),
+        "forecast": daily,
     }
 
 # --- background task endpoint (explicit) ---
-@router.post("/{task_id}/remind")
-def remind_task(
-    request: Request,
+@router.post("/{task_id}/remind", response_class=ORJSONResponse)
+async def remind_task(
     response: Response,
     task_id: int,
     bg: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     r: Redis = Depends(get_redis),
-    _: User = Depends(require_user),
+    user: AuthUser = Depends(require_user),
 ):
-    enforce_rate_limit(request, response, r)
+    await enforce_rate_limit(response, r, user)
 
-    task = db.get(Task, task_id)
+    task = await db.get(Task, task_id, options=[raiseload("*")])
     if not task:
         raise AppError("not_found", "Task not found.", 404)
 
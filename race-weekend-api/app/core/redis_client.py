@@ -0,0 +1,11 @@
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+# One pool per process; connections are opened lazily and reused across requests.
+# Blocking so a burst past max_connections waits (up to timeout) for a free
+# connection instead of raising MaxConnectionsError.
+pool = redis.BlockingConnectionPool.from_url(
+    settings.REDIS_URL, decode_responses=True, max_connections=64, timeout=5
+)
+redis_client = redis.Redis(connection_pool=pool)
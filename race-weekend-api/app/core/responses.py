@@ -0,0 +1,15 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+
+    Only for routes returning plain dicts (and error bodies). Routes with a
+    response_model keep FastAPI's default class, which serializes straight
+    through Pydantic and is faster still.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
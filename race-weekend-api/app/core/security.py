@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict
 import hashlib
+import time
 
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.exceptions.handlers import AppError
 
-# Base passlib context
+# New hashes: argon2id via argon2-cffi directly (passlib's argon2 loader relies on
+# argon2.__version__, which argon2-cffi is removing).
+_argon2 = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)  # memory in KiB
+
+# Base passlib context: only verifies legacy bcrypt hashes from before the switch.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -18,6 +26,9 @@ def _bcrypt_safe_input(password: str) -> str:
     """
     bcrypt hard-limits input to 72 BYTES.
 
+    argon2 has no such limit, but legacy bcrypt hashes were created from this
+    pre-hashed form, so argon2 receives the same input for consistency.
+
     To make password hashing robust (even if some code accidentally calls
     pwd_context.hash() directly), we convert the password into a fixed-length,
     bcrypt-safe string via SHA-256 (64 hex chars).
@@ -55,20 +66,30 @@ pwd_context.verify = _safe_verify  # type: ignore[assignment]
 
 def hash_password(password: str) -> str:
     """
-    Hash a password for storage.
+    Hash a password for storage (argon2id).
     """
-    # uses wrapped pwd_context.hash() which pre-hashes safely
-    return pwd_context.hash(password)
+    return _argon2.hash(_bcrypt_safe_input(password))
 
 
 def verify_password(password: str, hashed: str) -> bool:
     """
-    Verify a password against its stored hash.
+    Verify a password against its stored hash (argon2id, or legacy bcrypt).
     """
+    if hashed.startswith("$argon2"):
+        try:
+            return _argon2.verify(hashed, _bcrypt_safe_input(password))
+        except (VerificationError, InvalidHashError):
+            return False
     # uses wrapped pwd_context.verify() which pre-hashes safely
     return pwd_context.verify(password, hashed)
 
 
+# Bound once: one PyJWT instance, the secret pre-encoded, the algorithm list prebuilt
+_jwt = jwt.PyJWT()
+_JWT_KEY = settings.JWT_SECRET.encode("utf-8")
+_JWT_ALGORITHMS = [settings.JWT_ALG]
+
+
 def create_access_token(user_id: int, role: str) -> str:
     now = datetime.now(timezone.utc)
     exp = now + timedelta(minutes=settings.JWT_EXPIRES_MINUTES)
@@ -78,13 +99,25 @@ def create_access_token(user_id: int, role: str) -> str:
         "iat": int(now.timestamp()),
         "exp": int(exp.timestamp()),
     }
-    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
+    return _jwt.encode(payload, _JWT_KEY, algorithm=settings.JWT_ALG)
+
+
+@lru_cache(maxsize=4096)
+def _decode_verified(token: str) -> Dict[str, Any]:
+    # Tokens are self-contained, so a verified payload stays valid until "exp".
+    # Failures raise and are never cached; "exp" is required so nothing is cached forever.
+    return _jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options={"require": ["exp", "sub"]})
 
 
 def decode_token(token: str) -> Dict[str, Any]:
     try:
-        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+        payload = _decode_verified(token)
     except jwt.ExpiredSignatureError:
         raise AppError("unauthorized", "Token expired.", 401)
     except Exception:
         raise AppError("unauthorized", "Invalid token.", 401)
+
+    # cached entries outlive their token, so re-check expiry on every hit
+    if payload["exp"] <= time.time():
+        raise AppError("unauthorized", "Token expired.", 401)
+    return dict(payload)
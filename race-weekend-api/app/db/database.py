@@ -1,9 +1,36 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+# sync driver URLs (e.g. older .env files) are mapped onto their asyncio driver
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url(url: str) -> str:
+    u = make_url(url)
+    driver = _ASYNC_DRIVERS.get(u.get_backend_name())
+    if driver:
+        u = u.set(drivername=driver)
+    return u.render_as_string(hide_password=False)
+
+def _engine_kwargs(url: str) -> dict:
+    # SQLite is only used locally/in tests; aiosqlite connections are tied to the
+    # event loop that opened them, so don't pool them.
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_use_lifo": True,
+    }
+
+DATABASE_URL = async_database_url(settings.DATABASE_URL)
+
+engine = create_async_engine(DATABASE_URL, **_engine_kwargs(DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 class Base(DeclarativeBase):
     pass
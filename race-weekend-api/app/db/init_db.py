@@ -0,0 +1,13 @@
+import asyncio
+
+from app.db.database import Base, engine
+import app.db.models  # noqa: F401  (registers the tables on Base.metadata)
+
+async def init_db() -> None:
+    # For the assignment this is fine. In real prod you’d run migrations (Alembic).
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+if __name__ == "__main__":
+    # run once before starting multi-worker uvicorn, so workers don't race on CREATE TABLE
+    asyncio.run(init_db())
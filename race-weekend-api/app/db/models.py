@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Boolean, ForeignKey, Date, DateTime, func
+from sqlalchemy import String, Integer, Boolean, ForeignKey, Date, DateTime, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.database import Base
 
@@ -26,6 +26,18 @@ class Event(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # list_tasks: (assignee_id = me OR assignee_id IS NULL) [+ event_id], often sorted by due_at
+        Index("ix_tasks_assignee_event_due", "assignee_id", "event_id", "due_at"),
+        # team-wide (unassigned) half of that OR
+        Index(
+            "ix_tasks_team",
+            "event_id",
+            "due_at",
+            postgresql_where=text("assignee_id IS NULL"),
+            sqlite_where=text("assignee_id IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
@@ -1,5 +1,5 @@
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from app.core.responses import ORJSONResponse
 from app.schemas.errors import ErrorResponse
 
 class AppError(Exception):
@@ -9,7 +9,7 @@ class AppError(Exception):
         self.status_code = status_code
 
 async def app_error_handler(request: Request, exc: AppError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
             request_id=getattr(request.state, "request_id", None),
@@ -19,7 +19,7 @@ async def app_error_handler(request: Request, exc: AppError):
     )
 
 async def unhandled_error_handler(request: Request, exc: Exception):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content=ErrorResponse(
             request_id=getattr(request.state, "request_id", None),
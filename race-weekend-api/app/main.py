@@ -1,10 +1,13 @@
 import logging
+
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.db.database import engine, Base
+from app.core.redis_client import pool as redis_pool
+from app.db.init_db import init_db
 from app.exceptions.handlers import AppError, app_error_handler, unhandled_error_handler
 from app.middleware.request_id import RequestIDMiddleware
 
@@ -27,6 +30,15 @@ def create_app() -> FastAPI:
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
+        # custom response headers are hidden from browser JS unless exposed
+        expose_headers=[
+            "X-Next-Cursor",
+            "X-RateLimit-Limit",
+            "X-RateLimit-Remaining",
+            "X-RateLimit-Reset",
+            "Retry-After",
+            "X-Request-ID",
+        ],
     )
 
     # Request ID middleware
@@ -43,9 +55,22 @@ def create_app() -> FastAPI:
     app.include_router(health_router)
 
     @app.on_event("startup")
-    def on_startup():
-        # For the assignment this is fine. In real prod you’d run migrations (Alembic).
-        Base.metadata.create_all(bind=engine)
+    async def on_startup():
+        # dev convenience; multi-worker deployments run `python -m app.db.init_db` once instead
+        if settings.DB_CREATE_ALL_ON_STARTUP:
+            await init_db()
+
+        # one outbound client per process: keeps TLS/HTTP2 connections to weather providers warm
+        app.state.http = httpx.AsyncClient(
+            http2=True,
+            timeout=8.0,
+            limits=httpx.Limits(max_keepalive_connections=50),
+        )
+
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        await app.state.http.aclose()
+        await redis_pool.disconnect()
 
     return app
 
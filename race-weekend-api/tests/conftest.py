@@ -5,7 +5,9 @@ from pathlib import Path
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # -----------------------------------------------------------------------------
 # CRITICAL: set a TEST DATABASE_URL at import time (before pytest collection)
@@ -60,10 +62,25 @@ def engine(test_db_url: str):
         engine.dispose()
 
 
+@pytest.fixture(scope="session")
+def async_engine(test_db_url: str, engine):
+    """
+    Async engine on the same SQLite file, used by the app's get_db overrides.
+    NullPool: each TestClient runs its own event loop, and aiosqlite
+    connections can't be shared across loops.
+    """
+    async_engine = create_async_engine(
+        test_db_url.replace("sqlite://", "sqlite+aiosqlite://", 1),
+        poolclass=NullPool,
+    )
+    yield async_engine
+    async_engine.sync_engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def db_session(engine):
     """
-    New DB session per test function.
+    New DB session per test function (for direct setup/asserts in tests).
     """
     TestingSessionLocal = sessionmaker(
         bind=engine, autoflush=False, autocommit=False, future=True
@@ -77,7 +94,7 @@ def db_session(engine):
 
 
 @pytest.fixture(scope="function")
-def app(db_session):
+def app(db_session, async_engine):
     """
     Create FastAPI app and override router-level get_db dependencies.
     """
@@ -85,9 +102,13 @@ def app(db_session):
     from app.api.v1 import routes_auth, routes_events, routes_tasks
 
     fastapi_app = create_app()
+    TestingAsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
 
-    def override_get_db():
-        yield db_session
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
 
     fastapi_app.dependency_overrides[routes_auth.get_db] = override_get_db
     fastapi_app.dependency_overrides[routes_events.get_db] = override_get_db
@@ -96,6 +117,20 @@ def app(db_session):
     return fastapi_app
 
 
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    """
+    Process-local caches would otherwise leak between tests.
+    """
+    from app.api.v1 import routes_tasks
+
+    routes_tasks._local_cache.clear()
+    routes_tasks._local_versions.clear()
+    yield
+    routes_tasks._local_cache.clear()
+    routes_tasks._local_versions.clear()
+
+
 @pytest.fixture(scope="function")
 def client(app):
     with TestClient(app) as c:
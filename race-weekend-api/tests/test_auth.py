@@ -1,4 +1,8 @@
 # tests/test_auth.py
+import pytest
+
+from app.core import security
+from app.exceptions.handlers import AppError
 from tests.conftest import register_user
 
 def test_register_and_login(client):
@@ -13,3 +17,63 @@ def test_register_and_login(client):
 def test_register_rejects_weak_password(client):
     r = client.post("/v1/auth/register", json={"email": "weak@test.com", "password": "short"})
     assert r.status_code == 422  # pydantic validation error
+
+def test_login_unknown_email_rejected(client):
+    r = client.post("/v1/auth/login", json={"email": "nobody@test.com", "password": "StrongPass1!"})
+    assert r.status_code == 401
+    assert r.json()["error"] == "invalid_credentials"
+
+def test_password_hash_uses_argon2id():
+    from app.core.security import hash_password, verify_password
+    hashed = hash_password("StrongPass1!")
+    assert hashed.startswith("$argon2id$")
+    assert verify_password("StrongPass1!", hashed)
+    assert not verify_password("WrongPass1!", hashed)
+
+def test_expired_token_rejected_even_when_cached(monkeypatch):
+    token = security.create_access_token(user_id=1, role="user")
+    assert security.decode_token(token)["sub"] == "1"
+
+    # token is now in the verification cache; move the clock past "exp"
+    real_time = security.time.time
+    monkeypatch.setattr(security.time, "time", lambda: real_time() + 3600 * 24)
+    with pytest.raises(AppError) as exc:
+        security.decode_token(token)
+    assert exc.value.message == "Token expired."
+
+def test_missing_or_malformed_bearer_rejected(client):
+    for headers in ({}, {"Authorization": "Basic abc"}, {"Authorization": "Bearer not-a-jwt"}):
+        r = client.get("/v1/events", headers=headers)
+        assert r.status_code == 401
+        assert r.json()["error"] == "unauthorized"
+
+def test_legacy_bcrypt_hash_still_verifies():
+    # hashes stored before the argon2 switch went through the same pre-hash
+    legacy = security._original_hash(security._bcrypt_safe_input("StrongPass1!"))
+    assert legacy.startswith("$2")
+    assert security.verify_password("StrongPass1!", legacy)
+    assert not security.verify_password("WrongPass1!", legacy)
+
+def test_login_rehashes_legacy_bcrypt_to_argon2(client, db_session):
+    from app.db.models import User
+
+    email = "legacy@test.com"
+    assert register_user(client, email=email).status_code == 201
+    user = db_session.query(User).filter_by(email=email).one()
+    user.password_hash = security._original_hash(security._bcrypt_safe_input("StrongPass1!"))
+    db_session.commit()
+
+    login = client.post("/v1/auth/login", json={"email": email, "password": "StrongPass1!"})
+    assert login.status_code == 200
+
+    db_session.expire_all()
+    upgraded = db_session.query(User).filter_by(email=email).one().password_hash
+    assert upgraded.startswith("$argon2id$")
+    assert security.verify_password("StrongPass1!", upgraded)
+
+def test_token_without_exp_rejected():
+    token = security._jwt.encode({"sub": "1", "role": "user"}, security._JWT_KEY, algorithm=security.settings.JWT_ALG)
+    with pytest.raises(AppError) as exc:
+        security.decode_token(token)
+    assert exc.value.status_code == 401
+    assert exc.value.message == "Invalid token."
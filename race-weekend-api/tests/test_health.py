@@ -0,0 +1,29 @@
+# tests/test_health.py
+class PingRedis:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def ping(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return True
+
+
+def test_health(client):
+    r = client.get("/v1/health")
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+
+
+def test_health_detailed_reports_each_dependency(client, app):
+    from app.api.v1 import routes_health
+
+    app.dependency_overrides[routes_health.get_redis] = lambda: PingRedis()
+    ok = client.get("/v1/health/detailed").json()
+    assert ok["status"] == "ok"
+    assert ok["dependencies"] == {"database": True, "redis": True}
+
+    app.dependency_overrides[routes_health.get_redis] = lambda: PingRedis(fail=True)
+    degraded = client.get("/v1/health/detailed").json()
+    assert degraded["status"] == "degraded"
+    assert degraded["dependencies"] == {"database": True, "redis": False}
@@ -1,4 +1,5 @@
 # tests/test_rate_limit.py
+import asyncio
 import time
 
 from app.core.config import settings
@@ -7,19 +8,31 @@ class FakeRedis:
     def __init__(self):
         self.store = {}
 
-    def incr(self, key):
+    async def incr(self, key):
         self.store[key] = int(self.store.get(key, 0)) + 1
         return self.store[key]
 
-    def expire(self, key, _seconds):
+    async def expire(self, key, _seconds):
         return True
 
-    def get(self, key):
+    async def evalsha(self, _sha, _numkeys, key, now_ms, window_ms, limit, _member):
+        # stands in for the rate limiter's sliding-window script
+        hits = [t for t in self.store.get(key, []) if t > now_ms - window_ms]
+        allowed = len(hits) < limit
+        if allowed:
+            hits.append(now_ms)
+        self.store[key] = hits
+        return [int(allowed), len(hits), hits[0] if hits else now_ms]
+
+    async def get(self, key):
         return None
 
-    def setex(self, key, ttl, value):
+    async def setex(self, key, ttl, value):
         return True
 
+    async def mget(self, *keys):
+        return [None for _ in keys]
+
 def test_rate_limit_headers_present(client, app):
     # register/login
     client.post("/v1/auth/register", json={"email": "u@x.com", "password": "StrongPass1!"})
@@ -35,3 +48,14 @@ def test_rate_limit_headers_present(client, app):
     assert "X-RateLimit-Limit" in resp.headers
     assert "X-RateLimit-Remaining" in resp.headers
     assert "X-RateLimit-Reset" in resp.headers
+
+def test_check_rate_limit_blocks_after_limit(monkeypatch):
+    from app.core.rate_limit import check_rate_limit
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 2)
+    r = FakeRedis()
+
+    results = [asyncio.run(check_rate_limit(r, "user:1")) for _ in range(3)]
+
+    assert [rl.allowed for rl in results] == [True, True, False]
+    assert results[-1].remaining == 0
+    assert 0 <= results[-1].retry_after <= 60
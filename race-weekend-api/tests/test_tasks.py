@@ -1,32 +1,49 @@
 # tests/test_tasks.py
+import base64
+import json
+
+from pydantic import TypeAdapter
 from sqlalchemy import select
 
 from app.db.models import User
+from app.schemas.tasks import TaskOut
 from tests.conftest import register_user, login_user
 
 
 class FakeRedis:
     """
     Minimal Redis stub for rate limiting.
-    Supports the methods your rate_limit code calls: incr(), expire().
+    Supports the methods your rate_limit code calls: incr(), expire(), evalsha().
     """
     def __init__(self):
         self.store = {}
 
-    def incr(self, key):
+    async def incr(self, key):
         self.store[key] = int(self.store.get(key, 0)) + 1
         return self.store[key]
 
-    def expire(self, key, _seconds):
+    async def expire(self, key, _seconds):
         return True
 
+    async def evalsha(self, _sha, _numkeys, key, now_ms, window_ms, limit, _member):
+        # stands in for the rate limiter's sliding-window script
+        hits = [t for t in self.store.get(key, []) if t > now_ms - window_ms]
+        allowed = len(hits) < limit
+        if allowed:
+            hits.append(now_ms)
+        self.store[key] = hits
+        return [int(allowed), len(hits), hits[0] if hits else now_ms]
+
     # Optional methods (in case your code touches them)
-    def get(self, key):
+    async def get(self, key):
         return None
 
-    def setex(self, key, ttl, value):
+    async def setex(self, key, ttl, value):
         return True
 
+    async def mget(self, *keys):
+        return [None for _ in keys]
+
 
 def make_admin(db_session, email="admin@test.com"):
     user = db_session.execute(select(User).where(User.email == email)).scalar_one()
@@ -117,3 +134,163 @@ def test_tasks_crud_flow(client, app, db_session):
     # user deletes their assigned task
     d = client.delete(f"/v1/tasks/{task_id}", headers=headers)
     assert d.status_code == 204
+
+
+class CachingFakeRedis(FakeRedis):
+    """FakeRedis that keeps setex() values so cache hits can be exercised."""
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value.decode() if isinstance(value, bytes) else value
+        return True
+
+    async def mget(self, *keys):
+        return [self.store.get(k) for k in keys]
+
+
+def test_list_tasks_cached_json(client, app, db_session):
+    from app.api.v1 import routes_tasks
+    fake = CachingFakeRedis()
+    app.dependency_overrides[routes_tasks.get_redis] = lambda: fake
+
+    register_user(client, email="lister@test.com", password="StrongPass1!")
+    make_admin(db_session, email="lister@test.com")
+    headers = {"Authorization": f"Bearer {login_user(client, email='lister@test.com', password='StrongPass1!')}"}
+
+    ev = client.post(
+        "/v1/events",
+        json={"name": "Barber", "track_name": "Barber Motorsports Park", "city": "Birmingham", "state": "AL", "event_date": "2026-04-01"},
+        headers=headers,
+    )
+    event_id = ev.json()["id"]
+    client.post("/v1/tasks", json={"event_id": event_id, "title": "Fuel cans", "category": "pit"}, headers=headers)
+
+    first = client.get(f"/v1/tasks?event_id={event_id}", headers=headers)
+    assert first.status_code == 200
+    assert [t["title"] for t in first.json()] == ["Fuel cans"]
+    # the lean column/orjson body must stay compatible with the TaskOut schema
+    (task_out,) = TypeAdapter(list[TaskOut]).validate_json(first.content)
+    assert task_out.category == "pit" and task_out.priority == 3
+    assert "X-RateLimit-Remaining" in first.headers
+    assert any(k.startswith("cache:tasks:") for k in fake.store)
+
+    # second call is served from the cached JSON, with rate-limit headers intact
+    second = client.get(f"/v1/tasks?event_id={event_id}", headers=headers)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert int(second.headers["X-RateLimit-Remaining"]) == int(first.headers["X-RateLimit-Remaining"]) - 1
+
+    # with the in-process tier cleared, the Redis copy serves the same body
+    routes_tasks._local_cache.clear()
+    third = client.get(f"/v1/tasks?event_id={event_id}", headers=headers)
+    assert third.status_code == 200
+    assert third.content == first.content
+
+    # writes bump the cache version, so the next list reflects them immediately
+    task_id = first.json()[0]["id"]
+    client.patch(f"/v1/tasks/{task_id}", json={"title": "Fuel cans (full)"}, headers=headers)
+    client.post("/v1/tasks", json={"event_id": event_id, "title": "Tire warmers", "category": "pit"}, headers=headers)
+    fresh = client.get(f"/v1/tasks?event_id={event_id}", headers=headers)
+    assert [t["title"] for t in fresh.json()] == ["Fuel cans (full)", "Tire warmers"]
+
+
+def test_list_tasks_keyset_pagination(client, app, db_session):
+    from app.api.v1 import routes_tasks
+    app.dependency_overrides[routes_tasks.get_redis] = lambda: FakeRedis()
+
+    register_user(client, email="pager@test.com", password="StrongPass1!")
+    make_admin(db_session, email="pager@test.com")
+    headers = {"Authorization": f"Bearer {login_user(client, email='pager@test.com', password='StrongPass1!')}"}
+    pager_id = get_user_id(db_session, "pager@test.com")
+
+    ev = client.post(
+        "/v1/events",
+        json={"name": "VIR", "track_name": "Virginia International Raceway", "city": "Alton", "state": "VA", "event_date": "2026-05-01"},
+        headers=headers,
+    )
+    event_id = ev.json()["id"]
+    # duplicate and missing due dates exercise the id tie-break and NULLS LAST handling
+    for title, due in [("a", "2026-05-01T08:00:00Z"), ("b", None), ("c", "2026-05-01T08:00:00Z"), ("d", "2026-04-30T08:00:00Z"), ("e", None)]:
+        client.post(
+            "/v1/tasks",
+            json={"event_id": event_id, "title": title, "category": "prep", "due_at": due, "assignee_id": pager_id},
+            headers=headers,
+        )
+
+    for order in ("asc", "desc"):
+        seen, after = [], None
+        while True:
+            params = {"event_id": event_id, "sort": "due_at", "order": order, "limit": 2}
+            if after:
+                params["after"] = after
+            page = client.get("/v1/tasks", params=params, headers=headers)
+            assert page.status_code == 200
+            seen += [t["title"] for t in page.json()]
+            after = page.headers.get("X-Next-Cursor")
+            if not after:
+                break
+        assert sorted(seen) == ["a", "b", "c", "d", "e"]
+        assert seen[-2:] in (["b", "e"], ["e", "b"])  # NULL due dates last
+
+    bad = client.get("/v1/tasks", params={"after": "not-a-cursor"}, headers=headers)
+    assert bad.status_code == 400
+
+    # well-formed cursors whose values don't fit the sort column are rejected, not bound
+    for sort, crafted in [
+        ("priority", ["priority", "asc", "abc", 1]),
+        ("title", ["title", "asc", 5, 1]),
+        ("id", ["id", "asc", 1, True]),
+        ("priority", ["priority", "asc", None, 1]),
+        ("due_at", ["due_at", "asc", "not-a-date", 1]),
+    ]:
+        after = base64.urlsafe_b64encode(json.dumps(crafted).encode()).decode()
+        resp = client.get("/v1/tasks", params={"sort": sort, "after": after}, headers=headers)
+        assert resp.status_code == 400, crafted
+
+    empty = client.get("/v1/tasks", params={"event_id": event_id, "limit": 0}, headers=headers)
+    assert empty.status_code == 200
+    assert empty.json() == []
+    assert "X-Next-Cursor" not in empty.headers
+
+
+def test_event_weather_caches_geocoding_and_forecast(client, app, db_session):
+    import httpx
+    from app.api.v1 import routes_tasks
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        if request.url.host.startswith("geocoding"):
+            return httpx.Response(200, json={"results": [{"latitude": 33.53, "longitude": -86.62}]})
+        return httpx.Response(200, json={"daily": {"temperature_2m_max": [21.0]}})
+
+    fake = CachingFakeRedis()
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    app.dependency_overrides[routes_tasks.get_redis] = lambda: fake
+    app.dependency_overrides[routes_tasks.get_http] = lambda: http
+
+    register_user(client, email="wx@test.com", password="StrongPass1!")
+    make_admin(db_session, email="wx@test.com")
+    headers = {"Authorization": f"Bearer {login_user(client, email='wx@test.com', password='StrongPass1!')}"}
+    ev = client.post(
+        "/v1/events",
+        json={"name": "Barber", "track_name": "Barber Motorsports Park", "city": "Birmingham", "state": "AL", "event_date": "2026-04-01"},
+        headers=headers,
+    )
+    event_id = ev.json()["id"]
+
+    for _ in range(2):
+        w = client.get(f"/v1/tasks/event/{event_id}/weather", headers=headers)
+        assert w.status_code == 200
+        assert w.json()["forecast"] == {"temperature_2m_max": [21.0]}
+
+    assert calls.count("geocoding-api.open-meteo.com") == 1
+    assert calls.count("api.open-meteo.com") == 1
+
+
+def test_cors_exposes_pagination_and_rate_limit_headers(client):
+    r = client.get("/v1/health", headers={"Origin": "https://example.com"})
+    exposed = {h.strip().lower() for h in r.headers["access-control-expose-headers"].split(",")}
+    assert {"x-next-cursor", "x-ratelimit-remaining", "x-ratelimit-reset"} <= exposed